@@ -3,13 +3,45 @@
 The Lepton AI python library.
 """
 
-# Photon, Client and Remote are the main classes that we want to expose.
-from .cloudrun import Remote
-from .client import Client
-from .photon import Photon
+import importlib
+from typing import TYPE_CHECKING
+
 from ._version import __version__
 
-# Components that one can use to build applications around Photons.
-from .kv import KV
-from .queue import Queue
-from .objectstore import PrivateObjectStore, PublicObjectStore, ObjectStore
+# Photon, Client and Remote are the main classes that we want to expose, along
+# with the components that one can use to build applications around Photons.
+# leptonai.photon pulls in heavy dependencies such as fastapi, so it is imported
+# lazily here and inside the api and cli functions that load photons, to keep
+# code paths such as the `lep` cli fast.
+if TYPE_CHECKING:
+    from .cloudrun import Remote
+    from .client import Client
+    from .photon import Photon
+    from .kv import KV
+    from .queue import Queue
+    from .objectstore import PrivateObjectStore, PublicObjectStore, ObjectStore
+
+_LAZY_ATTRIBUTES = {
+    "Remote": "cloudrun",
+    "Client": "client",
+    "Photon": "photon",
+    "KV": "kv",
+    "Queue": "queue",
+    "PrivateObjectStore": "objectstore",
+    "PublicObjectStore": "objectstore",
+    "ObjectStore": "objectstore",
+}
+_LAZY_SUBMODULES = frozenset(_LAZY_ATTRIBUTES.values())
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__)
+        return getattr(module, name)
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRIBUTES) + list(_LAZY_SUBMODULES))
@@ -22,5 +22,12 @@ Lepton AI web APIs usually return two types of responses:
   python api simply returns the response itself.
 """
 
-from . import v0
+import importlib
+
 from . import v1
+
+
+def __getattr__(name):
+    if name == "v0":
+        return importlib.import_module(".v0", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
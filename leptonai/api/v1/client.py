@@ -84,6 +84,8 @@ class APIClient(object):
         # If workspace_id contains colon, it is a credential that also contains the token.
         if ":" in workspace_id and not auth_token:
             workspace_id, auth_token = workspace_id.split(":", 1)
+        # The local record of the workspace, or None if there is no such record.
+        record = WorkspaceRecord.get(workspace_id)
         # We will then resolve the auth token in the following order:
         # - user specified one
         # - environment variable LEPTON_WORKSPACE_TOKEN
@@ -91,21 +93,13 @@ class APIClient(object):
         auth_token = (
             auth_token
             or os.environ.get("LEPTON_WORKSPACE_TOKEN")
-            or (
-                WorkspaceRecord.get(workspace_id).auth_token  # type: ignore
-                if WorkspaceRecord.has(workspace_id)
-                else None
-            )
+            or (record.auth_token if record else None)
         )
         # We will then resolve the url in a similar order.
         url = (
             url
             or os.environ.get("LEPTON_WORKSPACE_URL")
-            or (
-                WorkspaceRecord.get(workspace_id).url  # type: ignore
-                if WorkspaceRecord.has(workspace_id)
-                else None
-            )
+            or (record.url if record else None)
             or _get_full_workspace_api_url(workspace_id)
         )
         self.workspace_id: str = workspace_id
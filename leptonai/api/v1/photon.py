@@ -1,15 +1,9 @@
 import os
-from typing import List, Union, Optional
+from typing import List, Sequence, Union, Optional
 
 from loguru import logger
 
 from leptonai.config import CACHE_DIR, LEPTON_RESERVED_ENV_NAMES
-from leptonai.photon.util import load
-from leptonai.photon.base import (
-    add_photon,
-    remove_local_photon,
-    find_all_local_photons,
-)
 
 from .api_resource import APIResourse
 from .types.deployment import Mount, EnvVar, EnvValue
@@ -18,7 +12,7 @@ from .types.deployment import LeptonDeployment
 
 
 def make_mounts_from_strings(
-    mounts: Optional[List[str]],
+    mounts: Optional[Sequence[str]],
 ) -> Optional[List[Mount]]:
     """
     Parses a list of mount strings into a list of Mount objects.
@@ -37,7 +31,7 @@ def make_mounts_from_strings(
 
 
 def make_env_vars_from_strings(
-    env: Optional[List[str]], secret: Optional[List[str]]
+    env: Optional[Sequence[str]], secret: Optional[Sequence[str]]
 ) -> Optional[List[EnvVar]]:
     if not env and not secret:
         return None
@@ -112,9 +106,12 @@ class PhotonAPI(APIResourse):
         path: Optional[str] = None,
         public_photon: bool = False,
     ):
+        from leptonai.photon.base import add_photon
+        from leptonai.photon.util import load
+
         id_ = id_or_photon if isinstance(id_or_photon, str) else id_or_photon.id_
         if path is None:
-            path = str(CACHE_DIR / f"tmp.{id}.photon")
+            path = str(CACHE_DIR / f"tmp.{id_}.photon")
             need_rename = True
         else:
             need_rename = False
@@ -127,8 +124,12 @@ class PhotonAPI(APIResourse):
             raise ValueError(
                 f"Failed to download photon {id_}. Details: {response.text}"
             )
+        # Stream the photon to disk in chunks, instead of holding the whole
+        # content in memory before writing it out.
         with open(path, "wb") as f:
-            f.write(response.content)
+            for chunk in response.iter_content(chunk_size=4096):
+                if chunk:
+                    f.write(chunk)
 
         photon = load(path)
 
@@ -142,7 +143,7 @@ class PhotonAPI(APIResourse):
             photon_model = photon.model  # type: ignore
 
         if need_rename:
-            new_path = CACHE_DIR / f"{photon_name}.{id}.photon"
+            new_path = CACHE_DIR / f"{photon_name}.{id_}.photon"
             os.rename(path, new_path)
         else:
             new_path = path
@@ -172,10 +173,14 @@ class PhotonAPI(APIResourse):
         """
         List the photons in the local cache directory.
         """
+        from leptonai.photon.base import find_all_local_photons
+
         photons = find_all_local_photons()
         return [p[1] for p in photons]
 
     def delete_local(self, name: str, remove_all: bool = False):
+        from leptonai.photon.base import remove_local_photon
+
         return remove_local_photon(name, remove_all)
 
     def fetch(self, id: str, path: str, public_photon: bool = False):
@@ -184,6 +189,9 @@ class PhotonAPI(APIResourse):
         :param str id: id of the photon to fetch
         :param str path: path to save the photon to
         """
+        from leptonai.photon.base import add_photon
+        from leptonai.photon.util import load
+
         if path is None:
             path = str(CACHE_DIR / f"tmp.{id}.photon")
             need_rename = True
@@ -198,7 +206,9 @@ class PhotonAPI(APIResourse):
         self.ensure_ok(response)
 
         with open(path, "wb") as f:
-            f.write(response.content)
+            for chunk in response.iter_content(chunk_size=4096):
+                if chunk:
+                    f.write(chunk)
 
         photon = load(path)
 
@@ -63,8 +63,17 @@ class PodAPI(APIResourse):
 
     def list_all(self) -> List[LeptonDeployment]:
         response = self._get("/deployments")
-        deployments = self.ensure_list(response, LeptonDeployment)
-        return [d for d in deployments if d.spec.is_pod]
+        # The api server does not support filtering by pod, so we filter on the raw
+        # json, and only construct the LeptonDeployment objects for the pods.
+        deployments = self.ensure_json(response)
+        try:
+            return [
+                LeptonDeployment(**d)
+                for d in deployments
+                if (d.get("spec") or {}).get("is_pod")
+            ]
+        except Exception as e:
+            self._print_programming_error(response, e)
 
     def create(self, spec: LeptonDeployment):
         """
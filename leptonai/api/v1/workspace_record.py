@@ -167,10 +167,10 @@ class WorkspaceRecord(object):
                     "You have not specified a workspace id, and have not set the"
                     " current workspace either."
                 )
-        if workspace_id in cls._singleton_record.workspaces:
+        ws = cls.get(workspace_id)
+        if ws is not None:
             from .client import APIClient
 
-            ws = cls._singleton_record.workspaces[workspace_id]
             return APIClient(ws.id_, ws.auth_token, ws.url)
         else:
             raise ValueError(
@@ -6,3 +6,9 @@ Constants for the CLI.
 # Storage
 STORAGE_DISPLAY_PREFIX_MIDDLE = "├──"
 STORAGE_DISPLAY_PREFIX_LAST = "└──"
+
+# Deployment
+# States in which a deployment (or pod) is up and serving.
+DEPLOYMENT_RUNNING_STATES = frozenset(("Running", "Ready"))
+# Display styles of deployment states; any other state is displayed in yellow.
+DEPLOYMENT_STATE_STYLES = {state: "green" for state in DEPLOYMENT_RUNNING_STATES}
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 import json
 from datetime import datetime
 import re
@@ -9,13 +10,22 @@ import click
 from loguru import logger
 from rich.pretty import Pretty
 from rich.table import Table
+from rich.text import Text
 from rich.prompt import Confirm
 
+from .constants import DEPLOYMENT_STATE_STYLES
 from .util import (
     console,
     check,
     click_group,
     _get_valid_nodegroup_ids,
+    _get_client,
+    _list_deployment_names,
+    _clear_deployment_names_cache,
+    _list_photons,
+    _photons_by_name,
+    _get_photon_deployment_template,
+    DeploymentName,
 )
 
 from leptonai.config import (
@@ -255,14 +265,11 @@ def _get_ordered_photon_ids_or_none(
     oldest. If no photon of such name exists, returns None.
     """
 
-    client = APIClient()
+    client = _get_client()
 
-    photons = client.photon.list_all(public_photon=public_photon)
-
-    target_photons = [p for p in photons if p.name == name]  # type: ignore
-    if len(target_photons) == 0:
+    target_photons = _photons_by_name(client, public_photon).get(name)
+    if not target_photons:
         return None
-    target_photons.sort(key=lambda p: p.created_at, reverse=True)  # type: ignore
     return [p.id_ for p in target_photons]  # type: ignore
 
 
@@ -593,17 +600,17 @@ def create(
     """
     Creates a deployment from either a photon or container image.
     """
-    client = APIClient()
+    client = _get_client()
     spec = LeptonDeploymentUserSpec()
 
-    existing_deployments = client.deployment.list_all()
-    if name in [d.metadata.name for d in existing_deployments]:
+    if name in _list_deployment_names(client):
         if rerun:
             console.print(
                 f"Deployment [green]{name}[/] already exists. Shutting down the"
                 " existing deployment and rerunning."
             )
             client.deployment.delete(name)
+            _clear_deployment_names_cache(client)
         else:
             console.print(
                 f"Deployment [green]{name}[/] already exists. Use `lep deployment"
@@ -639,8 +646,10 @@ def create(
         spec.photon_namespace = "public" if public_photon else "private"
 
         # get deployment template
-        photon = client.photon.get(photon_id, public_photon=public_photon)  # type: ignore
-        deployment_template = photon.deployment_template
+        assert photon_id is not None
+        deployment_template = _get_photon_deployment_template(
+            client, photon_id, public_photon
+        )
     elif container_image is not None or container_command is not None:
         # We will use container.
         if container_image is None:
@@ -734,43 +743,45 @@ def create(
         )
 
     # include workspace token
-    secret = list(secret)  # to convert secret from tuple to list
     if include_workspace_token:
         console.print("Including the workspace token for the photon execution.")
         _create_workspace_token_secret_var_if_not_existing(client)
         if "LEPTON_WORKSPACE_TOKEN" not in secret:
-            secret += [
-                "LEPTON_WORKSPACE_TOKEN",
-            ]
+            secret = (*secret, "LEPTON_WORKSPACE_TOKEN")
 
     try:
         logger.trace(f"deployment_template:\n{deployment_template}")
         template_envs = deployment_template.env or {}
-        env_list = list(env) or []
-        secret_list = list(secret) or []
-        mount_list = list(mount) or []
+        # names of the env vars explicitly passed in, so that checking the
+        # template envs against them is a set lookup instead of a prefix scan.
+        env_names = {s.partition("=")[0] for s in env if "=" in s}
         for k, v in template_envs.items():
-            if v == ENV_VAR_REQUIRED:
-                if not any(s.startswith(k + "=") for s in (env or [])):
-                    console.print(
-                        f"This deployment requires env var {k}, but it's missing."
-                        f" Please specify it with --env {k}=YOUR_VALUE. Otherwise,"
-                        " the deployment may fail."
-                    )
-            else:
-                if not any(s.startswith(k + "=") for s in env_list):
-                    # Adding default env variable if not specified.
-                    env_list.append(f"{k}={v}")
+            if v == ENV_VAR_REQUIRED and k not in env_names:
+                console.print(
+                    f"This deployment requires env var {k}, but it's missing."
+                    f" Please specify it with --env {k}=YOUR_VALUE. Otherwise,"
+                    " the deployment may fail."
+                )
+        # The env vars passed in, followed by the default env vars of the
+        # template that are not specified.
+        env_list = [
+            *env,
+            *(
+                f"{k}={v}"
+                for k, v in template_envs.items()
+                if v != ENV_VAR_REQUIRED and k not in env_names
+            ),
+        ]
         template_secrets = deployment_template.secret or []
         for k in template_secrets:
-            if k not in secret_list:
+            if k not in secret:
                 console.print(
                     f"This deployment requires secret {k}, but it's missing. Please"
                     f" set the secret, and specify it with --secret {k}. Otherwise,"
                     " the deployment may fail."
                 )
-        spec.envs = make_env_vars_from_strings(env_list, secret_list)
-        spec.mounts = make_mounts_from_strings(mount_list)
+        spec.envs = make_env_vars_from_strings(env_list, secret)
+        spec.mounts = make_mounts_from_strings(mount)
         spec.api_tokens = make_token_vars_from_config(public, tokens)
         spec.image_pull_secrets = list(image_pull_secrets)
         spec.auto_scaler = AutoScaler(
@@ -813,6 +824,7 @@ def create(
     )
     logger.trace(json.dumps(lepton_deployment.model_dump(), indent=2))
     client.deployment.create(lepton_deployment)
+    _clear_deployment_names_cache(client)
     console.print(
         f"Deployment created as [green]{name}[/]. Use `lep deployment"
         f" status -n {name}` to check the status."
@@ -831,7 +843,7 @@ def list_command(pattern):
     Lists all deployments in the current workspace.
     """
 
-    client = APIClient()
+    client = _get_client()
 
     deployments = client.deployment.list_all()
     # For the photon id field, we will show either the photon id, or the container
@@ -845,8 +857,7 @@ def list_command(pattern):
                 if d.spec.photon_id is not None
                 else (d.spec.container.image or "（unknown）")
             ),
-            d.metadata.created_at
-            / 1000,  # convert to seconds from milliseconds # type: ignore
+            d.metadata.created_at,
             d.status,
         )
         for d in deployments
@@ -868,13 +879,17 @@ def list_command(pattern):
     table.add_column("photon id")
     table.add_column("created at")
     table.add_column("status")
+    pattern_regex = re.compile(pattern) if pattern is not None else None
     for name, photon_id, created_at, status in records:
-        if pattern is not None and (name is None or not re.search(pattern, name)):
+        if pattern_regex and (name is None or not pattern_regex.search(name)):
             continue
         table.add_row(
             name,
             photon_id,
-            datetime.fromtimestamp(created_at).strftime("%Y-%m-%d\n%H:%M:%S"),
+            # created_at is in milliseconds.
+            datetime.fromtimestamp(created_at / 1000).strftime(  # type: ignore
+                "%Y-%m-%d\n%H:%M:%S"
+            ),
             status.state,
         )
     console.print(table)
@@ -882,18 +897,31 @@ def list_command(pattern):
 
 
 @deployment.command()
-@click.option("--name", "-n", help="The deployment name to remove.", required=True)
+@click.option(
+    "--name",
+    "-n",
+    type=DeploymentName(),
+    help="The deployment name to remove.",
+    required=True,
+)
 def remove(name):
     """
     Removes a deployment.
     """
-    client = APIClient()
+    client = _get_client()
     client.deployment.delete(name)
+    _clear_deployment_names_cache(client)
     console.print(f"Job [green]{name}[/] deleted successfully.")
 
 
 @deployment.command()
-@click.option("--name", "-n", help="The deployment name to get status.", required=True)
+@click.option(
+    "--name",
+    "-n",
+    type=DeploymentName(),
+    help="The deployment name to get status.",
+    required=True,
+)
 @click.option(
     "--show-tokens",
     "-t",
@@ -912,9 +940,15 @@ def status(name, show_tokens, detail):
     """
     check(name, "Deployment name not specified. Use `lep deployment status -n <name>`.")
 
-    client = APIClient()
+    client = _get_client()
 
-    dep_info = client.deployment.get(name)
+    # The deployment info, readiness and terminations are independent api calls,
+    # so we issue them concurrently instead of paying for three round trips.
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        dep_info_future = executor.submit(client.deployment.get, name)
+        readiness_future = executor.submit(client.deployment.get_readiness, name)
+        terminations_future = executor.submit(client.deployment.get_termination, name)
+    dep_info = dep_info_future.result()
     workspace_id = client.get_workspace_id()
 
     # todo: print a cleaner dep info.
@@ -923,10 +957,7 @@ def status(name, show_tokens, detail):
     ).strftime("%Y-%m-%d %H:%M:%S")
 
     state = dep_info.status.state
-    if state in ("Running", "Ready"):
-        state = f"[green]{state}[/]"
-    else:
-        state = f"[yellow]{state}[/]"
+    state = f"[{DEPLOYMENT_STATE_STYLES.get(state, 'yellow')}]{state}[/]"
     console.print(f"Time now:   {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     console.print(f"Created at: {creation_time}")
 
@@ -985,7 +1016,7 @@ def status(name, show_tokens, detail):
 
     console.print("Replicas List:")
 
-    reading_issue_root = client.deployment.get_readiness(name).root
+    reading_issue_root = readiness_future.result().root
     # Print a table of readiness information.
     table = Table(show_lines=False)
     table.add_column("replica id")
@@ -995,21 +1026,19 @@ def status(name, show_tokens, detail):
     for id, value in reading_issue_root.items():
         reason = value[0].reason
         message = value[0].message
-        # Do we need to display red?
+        # Styled Text cells, so that rich does not parse markup for every row.
         if reason == "Ready":
-            reason = f"[green]{reason}[/]"
             ready_count += 1
+            reason_cell = Text(reason, style="green")
         else:
-            reason = f"[yellow]{reason}[/]"
-        if message == "":
-            message = "(empty)"
-        table.add_row(id, reason, message)
+            reason_cell = Text(reason, style="yellow")
+        table.add_row(id, reason_cell, message or "(empty)")
     console.print(table)
     console.print(
         f"[green]{ready_count}[/] out of {len(reading_issue_root)} replicas ready."
     )
 
-    deployment_terminations_root = client.deployment.get_termination(name).root
+    deployment_terminations_root = terminations_future.result().root
 
     if len(deployment_terminations_root):
         console.print("There are earlier terminations. Detailed Info:")
@@ -1032,7 +1061,7 @@ def status(name, show_tokens, detail):
                 table.add_row(
                     id,
                     f"{start_time}\n{end_time}",
-                    f"[yellow]{reason} ({code})[/]",
+                    Text(f"{reason} ({code})", style="yellow"),
                     message,
                 )
         console.print(table)
@@ -1041,7 +1070,13 @@ def status(name, show_tokens, detail):
 
 
 @deployment.command()
-@click.option("--name", "-n", help="The deployment name to get log.", required=True)
+@click.option(
+    "--name",
+    "-n",
+    type=DeploymentName(),
+    help="The deployment name to get log.",
+    required=True,
+)
 @click.option("--replica", "-r", help="The replica name to get log.", default=None)
 def log(name, replica):
     """
@@ -1049,7 +1084,7 @@ def log(name, replica):
     is selected. Otherwise, the log of the specified replica is shown. To get the
     list of replicas, use `lep deployment status`.
     """
-    client = APIClient()
+    client = _get_client()
 
     if not replica:
         # obtain replica information, and then select the first one.
@@ -1086,7 +1121,13 @@ def log(name, replica):
 
 
 @deployment.command()
-@click.option("--name", "-n", help="The deployment name to update.", required=True)
+@click.option(
+    "--name",
+    "-n",
+    type=DeploymentName(),
+    help="The deployment name to update.",
+    required=True,
+)
 @click.option(
     "--id",
     "-i",
@@ -1234,6 +1275,16 @@ def log(name, replica):
         " setting will be used."
     ),
 )
+@click.option(
+    "--yes",
+    "-y",
+    is_flag=True,
+    default=False,
+    help=(
+        "If specified, do not ask for confirmation when the update triggers a"
+        " rolling restart. Useful for scripted updates."
+    ),
+)
 def update(
     name,
     id,
@@ -1249,6 +1300,7 @@ def update(
     autoscale_gpu_util,
     autoscale_qpm,
     log_collection,
+    yes,
 ):
     """
     Updates a deployment. Note that for all the update options, changes are made
@@ -1256,7 +1308,7 @@ def update(
     old tokens are replaced by the new set of tokens.
     """
 
-    client = APIClient()
+    client = _get_client()
     lepton_deployment = client.deployment.get(name)
 
     if id == "latest":
@@ -1266,7 +1318,7 @@ def update(
             lepton_deployment.spec.photon_namespace or "private"
         ) == "public"
 
-        photons = client.photon.list_all(public_photon)
+        photons = _list_photons(client, public_photon)
 
         for photon in photons:
             if photon.id_ == current_photon_id:
@@ -1278,12 +1330,7 @@ def update(
                 f" [red]{WorkspaceRecord.get_current_workspace_id()}[/]."
             )
             sys.exit(1)
-        records = [
-            (photon.name, photon.model, photon.id_, photon.created_at)
-            for photon in photons
-            if photon.name == current_photon_name
-        ]
-        id = sorted(records, key=lambda x: x[3])[-1][2]  # type: ignore
+        id = _photons_by_name(client, public_photon)[current_photon_name][0].id_
         console.print(f"Updating to latest photon id [green]{id}[/].")
     if remove_tokens:
         # [] means removing all tokens
@@ -1378,14 +1425,15 @@ def update(
         ])
         if will_restart:
 
-            confirmed = (not sys.stdin.isatty()) or Confirm.ask(
-                "This update will trigger a rolling restart. Are you sure you want"
-                " continue?",
-                default=True,
-            )
+            if not yes:
+                confirmed = (not sys.stdin.isatty()) or Confirm.ask(
+                    "This update will trigger a rolling restart. Are you sure you"
+                    " want continue?",
+                    default=True,
+                )
 
-            if not confirmed:
-                sys.exit(1)
+                if not confirmed:
+                    sys.exit(1)
 
             replicas = client.deployment.get_replicas(lepton_deployment)
 
@@ -1410,12 +1458,18 @@ def update(
 
 
 @deployment.command()
-@click.option("--name", "-n", help="The deployment name to get status.", required=True)
+@click.option(
+    "--name",
+    "-n",
+    type=DeploymentName(),
+    help="The deployment name to get status.",
+    required=True,
+)
 def events(name):
     """
     List events of the deployment
     """
-    client = APIClient()
+    client = _get_client()
     events = client.deployment.get_events(name)
 
     table = Table(title="Deployment Events", show_header=True, show_lines=False)
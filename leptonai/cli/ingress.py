@@ -3,8 +3,7 @@ import json
 import click
 from datetime import datetime
 from rich.table import Table
-from .util import console, click_group
-from leptonai.api.v1.client import APIClient
+from .util import console, click_group, _get_client
 from ..api.v1.types.common import Metadata
 from ..api.v1.types.ingress import LeptonIngress, LeptonIngressUserSpec
 
@@ -22,7 +21,7 @@ def list_all():
     """
     List all ingress
     """
-    client = APIClient()
+    client = _get_client()
     ingress_list = client.ingress.list_all()
     table = Table(show_header=True, header_style="bold magenta")
     table.add_column("Name")
@@ -52,7 +51,7 @@ def create(domain_name):
     """
     Create an ingress
     """
-    client = APIClient()
+    client = _get_client()
     lepton_ingress = LeptonIngress(
         metadata=Metadata(),
         spec=LeptonIngressUserSpec(domain_name=domain_name),
@@ -67,7 +66,7 @@ def get(name):
     """
     Get a ingress by name and print it in json
     """
-    client = APIClient()
+    client = _get_client()
     ingress = client.ingress.get(name)
     console.print(f"Ingress details for [green]{name}[/]:")
     console.print(json.dumps(client.ingress.safe_json(ingress), indent=2))
@@ -79,7 +78,7 @@ def delete(name):
     """
     Delete a ingress by name
     """
-    client = APIClient()
+    client = _get_client()
     client.ingress.delete(name)
     console.print(f"Ingress [green]{name}[/] deleted successfully.")
 
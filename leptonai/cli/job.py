@@ -12,6 +12,8 @@ from .util import (
     catch_deprecated_flag,
     check,
     _get_valid_nodegroup_ids,
+    _get_client,
+    _check_resource_shape_or_die,
 )
 from leptonai.api.v1.photon import make_mounts_from_strings, make_env_vars_from_strings
 from leptonai.config import BASE_IMAGE, VALID_SHAPES
@@ -23,7 +25,6 @@ from leptonai.api.v1.types.job import (
     LeptonResourceAffinity,
 )
 from leptonai.api.v1.types.deployment import ContainerPort, LeptonLog
-from leptonai.api.v1.client import APIClient
 
 
 @click_group()
@@ -226,15 +227,9 @@ def create(
     For advanced uses, check https://kubernetes.io/docs/concepts/workloads/controllers/job/.
     """
 
-    if resource_shape is None:
-        available_types = "\n      ".join(VALID_SHAPES)
-        console.print(
-            "[red]Error: Missing option '--resource-shape'.[/] "
-            f"Available types are:\n      {available_types}. \n"
-        )
-        sys.exit(1)
+    _check_resource_shape_or_die(resource_shape)
 
-    client = APIClient()
+    client = _get_client()
     if file:
         try:
             with open(file, "r") as f:
@@ -304,7 +299,7 @@ def list_command():
     """
     Lists all jobs in the current workspace.
     """
-    client = APIClient()
+    client = _get_client()
     jobs = client.job.list_all()
     logger.trace(f"Jobs: {jobs}")
 
@@ -335,7 +330,7 @@ def get(name):
     """
     Gets the job with the given name.
     """
-    client = APIClient()
+    client = _get_client()
     job = client.job.get(name)
     console.print(f"Job details for [green]{name}[/]:")
     console.print(json.dumps(client.job.safe_json(job), indent=2))
@@ -347,7 +342,7 @@ def remove(name):
     """
     Removes the job with the given name.
     """
-    client = APIClient()
+    client = _get_client()
     client.job.delete(name)
     console.print(f"Job [green]{name}[/] deleted successfully.")
 
@@ -361,7 +356,7 @@ def log(name, replica):
     is selected. Otherwise, the log of the specified replica is shown. To get the
     list of replicas, use `lep job status`.
     """
-    client = APIClient()
+    client = _get_client()
 
     if not replica:
         # obtain replica information, and then select the first one.
@@ -397,7 +392,7 @@ def log(name, replica):
 @click.option("--name", "-n", help="The job name to get replicas.", required=True)
 def replicas(name):
 
-    client = APIClient()
+    client = _get_client()
 
     replicas = client.job.get_replicas(name)
 
@@ -414,7 +409,7 @@ def replicas(name):
 @click.option("--name", "-n", help="The job name to get events.", required=True)
 def events(name, replica=None):
 
-    client = APIClient()
+    client = _get_client()
 
     events = client.job.get_events(name)
 
@@ -7,8 +7,7 @@ import re
 
 from rich.table import Table
 
-from leptonai.api.v1.client import APIClient
-from .util import console, click_group
+from .util import console, click_group, _get_client
 
 
 @click_group()
@@ -32,7 +31,7 @@ def create(name):
     """
     Creates a KV of the given name.
     """
-    c = APIClient()
+    c = _get_client()
     c.kv.create_namespace(name)
     console.print(
         f"Successfully created KV [green]{name}[/].\nNote that KV creation is"
@@ -50,10 +49,11 @@ def list_command(pattern):
     Lists all kvs in the current workspace. Note that the kv values are
     always hidden.
     """
-    c = APIClient()
+    c = _get_client()
     kvs = c.kv.list_namespaces()
     if pattern:
-        kvs = [kv for kv in kvs if re.match(pattern, kv.metadata.name)]  # type: ignore
+        pattern_regex = re.compile(pattern)
+        kvs = [kv for kv in kvs if pattern_regex.match(kv.metadata.name)]  # type: ignore
     table = Table(title="KV", show_lines=True)
     table.add_column("name")
     for kv in kvs:
@@ -67,7 +67,7 @@ def remove(name):
     """
     Removes the KV with the given name.
     """
-    c = APIClient()
+    c = _get_client()
     c.kv.delete_namespace(name)
     console.print(
         f"Successfully deleted KV [green]{name}[/].\nNote that KV deletion is"
@@ -84,7 +84,7 @@ def putkey(name, key, value):
     """
     Sends a message to the kv with the given name.
     """
-    c = APIClient()
+    c = _get_client()
     c.kv.put(name, key, value)
     console.print(f"Successfully put key [green]{key}[/] to KV [green]{name}[/].")
 
@@ -96,7 +96,7 @@ def getkey(name, key):
     """
     Receives a message from the kv with the given name.
     """
-    c = APIClient()
+    c = _get_client()
     value = c.kv.get(name, key)
     console.print(
         f"Successfully received message from kv [green]{name}[/] and key"
@@ -111,7 +111,7 @@ def deletekey(name, key):
     """
     Receives a message from the kv with the given name.
     """
-    c = APIClient()
+    c = _get_client()
     c.kv.delete(name, key)
     console.print(
         f"Successfully deleted key {key} from kv [green]{name}[/].",
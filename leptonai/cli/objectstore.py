@@ -12,8 +12,8 @@ from .util import (
     console,
     click_group,
     sizeof_fmt,
+    _get_client,
 )
-from ..api.v1.client import APIClient
 
 _max_upload_file_size_limit = 4995 * 1024 * 1024
 
@@ -45,7 +45,7 @@ def get(key, file, public, return_url):
     """
     if not file:
         file = os.path.basename(key)
-    client = APIClient()
+    client = _get_client()
 
     response = client.object_storage.get(
         key, return_url=return_url, is_public=public, stream=True
@@ -70,7 +70,7 @@ def cat(key, public):
     """
     Gets the object with the given key and prints it to stdout.
     """
-    client = APIClient()
+    client = _get_client()
 
     response = client.object_storage.get(key, public, stream=True)
     for chunk in response.iter_content(chunk_size=4096):
@@ -99,7 +99,7 @@ def put(key, file, public):
         )
         return
 
-    client = APIClient()
+    client = _get_client()
     if not os.path.exists(file):
         console.print(f"File [red]{file}[/] does not exist.")
         return
@@ -116,7 +116,7 @@ def delete(key, public):
     Deletes the object with the given key.
     """
 
-    client = APIClient()
+    client = _get_client()
     client.object_storage.delete(key, public)
     console.print(f"Successfully deleted object [green]{key}[/].")
 
@@ -129,7 +129,7 @@ def list_command(prefix, public):
     Lists all objects in the current workspace.
     """
 
-    client = APIClient()
+    client = _get_client()
 
     storage_metadatas = client.object_storage.list(prefix, public)
     console.print("List of objects in the current workspace:")
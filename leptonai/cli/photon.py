@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import json
 import os
@@ -7,7 +8,7 @@ import subprocess
 import sys
 import tempfile
 import traceback
-from typing import Optional, List, Tuple
+from typing import NamedTuple, Optional, List, Tuple
 
 from rich.console import Console
 from rich.prompt import Confirm
@@ -18,23 +19,18 @@ from loguru import logger
 
 from leptonai.api.v1.workspace_record import WorkspaceRecord
 from leptonai import config
-from leptonai.photon import util as photon_util
-from leptonai.photon import Photon
-from leptonai.photon.base import (
-    BasePhoton,
-    find_all_local_photons,
-    find_local_photon,
-    remove_local_photon,
-)
-from leptonai.photon.constants import METADATA_VCS_URL_KEY
-from leptonai.photon.download import fetch_code_from_vcs
 from leptonai.util import find_available_port
 
 from .util import (
     click_group,
     check,
+    _get_client,
+    _list_deployment_names,
+    _clear_deployment_names_cache,
+    _list_photons,
+    _photons_by_name,
+    _remove_cached_photon_template,
 )
-from leptonai.api.v1.client import APIClient
 from leptonai.api.v1.photon import make_env_vars_from_strings
 
 from .deployment import create as deployment_create
@@ -43,6 +39,16 @@ from .deployment import create as deployment_create
 console = Console(highlight=False)
 
 
+class _PhotonRecord(NamedTuple):
+    """A photon version as displayed by `lep photon list`."""
+
+    name: str
+    model: str
+    id_: str
+    # Creation time in seconds since the epoch.
+    created_at: float
+
+
 def _get_ordered_photon_ids_or_none(
     name: str, public_photon: bool
 ) -> Optional[List[str]]:
@@ -50,15 +56,12 @@ def _get_ordered_photon_ids_or_none(
     oldest. If no photon of such name exists, returns None.
     """
 
-    client = APIClient()
-
-    photons = client.photon.list_all(public_photon=public_photon)
+    client = _get_client()
 
-    target_photons = [p for p in photons if p.name == name]  # type: ignore
-    if len(target_photons) == 0:
+    target_photons = _photons_by_name(client, public_photon).get(name)
+    if not target_photons:
         return None
-    target_photons.sort(key=lambda p: p.created_at, reverse=True)
-    return [p.id_ for p in target_photons]
+    return [p.id_ for p in target_photons]  # type: ignore
 
 
 def _get_most_recent_photon_id_or_none(name: str, public_photon: bool) -> Optional[str]:
@@ -126,6 +129,9 @@ def create(name, model, requirements):
 
     Developer note: insert a link to the photon documentation here.
     """
+    from leptonai.photon import Photon
+    from leptonai.photon import util as photon_util
+
     try:
         photon = photon_util.create(name=name, model=model)
     except Exception as e:
@@ -200,7 +206,7 @@ def remove(name, local, id_, all_, public_photon):
     if not local and WorkspaceRecord.get_current_workspace_id() is not None:
         # Remove remote photon.
 
-        client = APIClient()
+        client = _get_client()
         # Find ids that we need to remove
         if name:
             # Remove all versions of the photon.
@@ -210,13 +216,48 @@ def remove(name, local, id_, all_, public_photon):
             ids = [ids[0]] if (not all_) else ids  # type: ignore
         else:
             ids = [id_]
-        # Actually remove the ids
-        for id_to_remove in ids:  # type: ignore
-            client.photon.delete(id_to_remove)
-            console.print(f"Photon id [green]{id_to_remove}[/] removed.")
+        # Actually remove the ids. The deletions are independent from each other,
+        # so they are issued concurrently when removing multiple versions. A
+        # failed deletion does not stop the others.
+        ids_to_remove: List[str] = ids  # type: ignore
+
+        def delete(id_to_remove: str) -> Optional[Exception]:
+            try:
+                client.photon.delete(id_to_remove, public_photon=public_photon)
+            except Exception as e:
+                return e
+            return None
+
+        failed_ids = []
+        try:
+            if len(ids_to_remove) > 1:
+                with ThreadPoolExecutor(
+                    max_workers=min(10, len(ids_to_remove))
+                ) as executor:
+                    errors = list(executor.map(delete, ids_to_remove))
+            else:
+                errors = [delete(id_to_remove) for id_to_remove in ids_to_remove]
+            for id_to_remove, error in zip(ids_to_remove, errors):
+                if error is not None:
+                    failed_ids.append(id_to_remove)
+                    console.print(
+                        f"[red]Failed to remove photon id {id_to_remove}:[/] {error}"
+                    )
+                    continue
+                _remove_cached_photon_template(client, id_to_remove, public_photon)
+                console.print(f"Photon id [green]{id_to_remove}[/] removed.")
+        finally:
+            _list_photons.cache_clear()
+            _photons_by_name.cache_clear()
+        check(
+            not failed_ids,
+            f"Failed to remove photon id(s): [red]{', '.join(failed_ids)}[/].",
+        )
         return
     else:
         # local mode
+        from leptonai.photon.base import find_local_photon, remove_local_photon
+
         check(name, "Must specify --name when removing local photon")
         check(find_local_photon(name), f"Photon [red]{name}[/] does not exist.")
         remove_local_photon(name, remove_all=all_)
@@ -249,13 +290,18 @@ def list_command(local, pattern, public_photon):
         "Cannot specify --public-photon and --local both.",
     )
     if not local and WorkspaceRecord.get_current_workspace_id() is not None:
-        client = APIClient()
-        photons = client.photon.list_all(public_photon=public_photon)
+        client = _get_client()
+        photons = _list_photons(client, public_photon)
         # Note: created_at returned by the server is in milliseconds, and as a
         # result we need to divide by 1000 to get seconds that is understandable
         # by the Python CLI.
         records = [
-            (photon.name, photon.model, photon.id_, photon.created_at / 1000)
+            _PhotonRecord(
+                photon.name,
+                photon.model,
+                photon.id_,  # type: ignore
+                photon.created_at / 1000,  # type: ignore
+            )
             for photon in photons
         ]
         ws_id = client.get_workspace_id()
@@ -265,10 +311,11 @@ def list_command(local, pattern, public_photon):
         else:
             title = f"Photons in workspace {ws_id}"
     else:
-        records = find_all_local_photons()
+        from leptonai.photon.base import find_all_local_photons
+
         records = [
-            (name, model, id_, creation_time)
-            for id_, name, model, _, creation_time in records
+            _PhotonRecord(name, model, id_, creation_time)
+            for id_, name, model, _, creation_time in find_all_local_photons()
         ]
         # We use current_workspace_id = None to indicate that we are in local mode.
         ws_id = None
@@ -281,34 +328,32 @@ def list_command(local, pattern, public_photon):
     table.add_column("Created At")
 
     records_by_name = {}
-    for name, model, id_, creation_time in records:
-        if pattern is None or re.match(pattern, name):
-            records_by_name.setdefault(name, []).append((model, id_, creation_time))
+    pattern_regex = re.compile(pattern) if pattern is not None else None
+    for record in records:
+        if pattern_regex is None or pattern_regex.match(record.name):
+            records_by_name.setdefault(record.name, []).append(record)
 
     # Sort by creation time and print
     for name, sub_records in records_by_name.items():
-        sub_records.sort(key=lambda r: r[2], reverse=True)
-        model_table = Table(show_header=False, box=None)
-        id_table = Table(show_header=False, box=None)
-        creation_table = Table(show_header=False, box=None)
-        for model, id_, creation_time in sub_records:
-            model_table.add_row(model)
-            id_table.add_row(id_)
-            # photon database stores creation time as a timestamp in
-            # milliseconds, so we need to convert.
-            creation_table.add_row(
-                datetime.fromtimestamp(creation_time).strftime("%Y-%m-%d %H:%M:%S")
-            )
-        table.add_row(name, model_table, id_table, creation_table)
+        sub_records.sort(key=lambda r: r.created_at, reverse=True)
+        # The versions of a photon are listed one per line within the same row.
+        table.add_row(
+            name,
+            "\n".join(r.model for r in sub_records),
+            "\n".join(r.id_ for r in sub_records),
+            "\n".join(
+                datetime.fromtimestamp(r.created_at).strftime("%Y-%m-%d %H:%M:%S")
+                for r in sub_records
+            ),
+        )
     console.print(table)
     if ws_id:
         console.print("To show local photons, use the `--local` flag.")
 
 
 def _find_deployment_name_or_die(name, id, deployment_name, rerun):
-    client = APIClient()
-    deployments = client.deployment.list_all()
-    existing_names = set(d.metadata.name for d in deployments)
+    client = _get_client()
+    existing_names = _list_deployment_names(client)
     if rerun:
         # Find the first fit deployment name, force remove deployment if it exists,
         # and return the name.
@@ -317,6 +362,7 @@ def _find_deployment_name_or_die(name, id, deployment_name, rerun):
         if deployment_name in existing_names:
             console.print(f"Removing deployment {deployment_name}...")
             client.deployment.delete(deployment_name)
+            _clear_deployment_names_cache(client)
             console.print(f"Deployment {deployment_name} removed.")
             return deployment_name
     # otherwise, try find a new name.
@@ -332,7 +378,6 @@ def _find_deployment_name_or_die(name, id, deployment_name, rerun):
             " flag."
         )
         base_name = name if name else id
-        # Make sure that deployment name is not longer than 32 characters
         deployment_name = base_name[:32]
         increment = 0
         while deployment_name in existing_names:
@@ -427,19 +472,21 @@ def run(
     check(not (name and photon_id), "Must specify either --id or --name, not both.")
 
     # remote execution.
+    # If --model is given, the photon is rebuilt and pushed, and that version is
+    # run. Otherwise, we first check if id is specified - this is the most
+    # specific way to refer to a photon. If not, we will check if name is
+    # specified - this might lead to multiple photons, so we will pick the latest
+    # one to run as the default behavior.
+    # TODO: Support push and run if the photon does not exist on remote
     if (name and model) and not photon_id:
         console.print(
             f"Rebuilding photon with --model {model}.\nIf you want to run without"
             " rebuilding, please remove the --model arg."
         )
         ctx.invoke(create, name=name, model=model)
-        ctx.invoke(push, name=name)
-    # We first check if id is specified - this is the most specific way to
-    # refer to a photon. If not, we will check if name is specified - this
-    # might lead to multiple photons, so we will pick the latest one to run
-    # as the default behavior.
-    # TODO: Support push and run if the photon does not exist on remote
-    if photon_id is None:
+        photon_id = ctx.invoke(push, name=name).id_
+        console.print(f"Running the version just pushed: [green]{photon_id}[/]")
+    elif photon_id is None:
         # look for the latest photon with the given name.
         photon_id = _get_most_recent_photon_id_or_none(name, False)
         if not photon_id:
@@ -511,6 +558,12 @@ def runlocal(
     """
     Run a photon locally.
     """
+    from leptonai.photon import Photon
+    from leptonai.photon import util as photon_util
+    from leptonai.photon.base import BasePhoton, find_local_photon
+    from leptonai.photon.constants import METADATA_VCS_URL_KEY
+    from leptonai.photon.download import fetch_code_from_vcs
+
     # local execution
     check(name or path, "Must specify either --name or --file.")
     if path is None:
@@ -655,6 +708,10 @@ def prepare(ctx, path):
     platform to prepare the environment inside the container and not meant to
     be used by users.
     """
+    from leptonai.photon import util as photon_util
+    from leptonai.photon.constants import METADATA_VCS_URL_KEY
+    from leptonai.photon.download import fetch_code_from_vcs
+
     metadata = photon_util.load_metadata(path, unpack_extra_files=True)
 
     if metadata.get(METADATA_VCS_URL_KEY, None):
@@ -775,13 +832,17 @@ def push(name, public_photon):
     """
     Push a photon to the workspace.
     """
-    client = APIClient()
+    from leptonai.photon.base import find_local_photon
+
+    client = _get_client()
     path = find_local_photon(name)
     assert path is None or isinstance(path, str)
     check(path and os.path.exists(path), f"Photon [red]{name}[/] does not exist.")
-    is_created = client.photon.create(path, public_photon)
-    if is_created:
-        console.print(f"Photon [green]{name}[/] pushed to workspace.")
+    created_photon = client.photon.create(path, public_photon)
+    _list_photons.cache_clear()
+    _photons_by_name.cache_clear()
+    console.print(f"Photon [green]{name}[/] pushed to workspace.")
+    return created_photon
 
 
 @photon.command()
@@ -818,17 +879,22 @@ def metadata(name, id, local, indent, public_photon):
     Returns the metadata json of the photon.
     """
     if local:
+        from leptonai.photon import util as photon_util
+        from leptonai.photon.base import find_local_photon
+
         check(id is None, "Cannot specify both --id and --local.")
         path = find_local_photon(name)
         check(path and os.path.exists(path), f"Photon [red]{name}[/] does not exist.")
+        metadata = photon_util.load_metadata(path)  # type: ignore
     else:
-        client = APIClient()
+        client = _get_client()
         if id is None:
             id = _get_most_recent_photon_id_or_none(name, public_photon)
             check(id, f"Photon [red]{name}[/] does not exist.")
 
         photon = client.photon.get(id, public_photon=public_photon)
-    console.print(json.dumps(json.loads(photon.json()), indent=indent))
+        metadata = json.loads(photon.json())
+    console.print(json.dumps(metadata, indent=indent))
 
 
 @photon.command()
@@ -838,7 +904,7 @@ def fetch(id, path):
     """
     Fetch a photon from the workspace.
     """
-    client = APIClient()
+    client = _get_client()
     photon_or_err = client.photon.fetch(id, path)
     console.print(f"Photon [green]{photon_or_err._photon_name}:{id}[/] fetched.")
 
@@ -8,6 +8,7 @@ environment. You can use it to run Jupyter notebooks, or to run a terminal
 session, similar to a cloud VM but much more lightweight.
 """
 
+from concurrent.futures import ThreadPoolExecutor
 import sys
 import json
 from datetime import datetime
@@ -27,12 +28,14 @@ from leptonai.config import (
     TCP_JUPYTER_PORT,
 )
 from leptonai.api.v1 import types
+from .constants import DEPLOYMENT_RUNNING_STATES
 from .util import (
     click_group,
     _get_only_replica_public_ip,
     _get_valid_nodegroup_ids,
+    _get_client,
+    _check_resource_shape_or_die,
 )
-from ..api.v1.client import APIClient
 from ..api.v1.photon import make_mounts_from_strings, make_env_vars_from_strings
 from ..api.v1.types.affinity import LeptonResourceAffinity
 from ..api.v1.types.deployment import ResourceRequirement, LeptonLog, LeptonContainer
@@ -140,13 +143,7 @@ def create(
     Creates a pod with the given resource shape, mount, env and secret.
     """
 
-    if resource_shape is None:
-        available_types = "\n      ".join(VALID_SHAPES)
-        console.print(
-            "[red]Error: Missing option '--resource-shape'.[/] "
-            f"Available types are:\n      {available_types}. \n"
-        )
-        sys.exit(1)
+    _check_resource_shape_or_die(resource_shape)
 
     spec_container = None
     if container_image or container_command:
@@ -161,7 +158,7 @@ def create(
             command=shlex.split(container_command) if container_command else None,
         )
 
-    client = APIClient()
+    client = _get_client()
 
     resource_requirement = ResourceRequirement(
         resource_shape=resource_shape or DEFAULT_RESOURCE_SHAPE,
@@ -213,52 +210,62 @@ def list_command(pattern):
     """
     Lists all pods in the current workspace.
     """
-    client = APIClient()
+    client = _get_client()
 
-    deployments = client.deployment.list_all()
+    pods = client.pod.list_all()
 
-    logger.trace(f"Deployments:\n{[d for d in deployments if d.spec.is_pod]}")
-    pods = [
-        d
-        for d in deployments
-        if d.spec.is_pod and (pattern is None or re.search(pattern, d.metadata.name))
-    ]
+    # lazy, so that the pod list is only formatted when tracing.
+    logger.opt(lazy=True).trace("Pods:\n{}", lambda: pods)
+    if pattern is not None:
+        pattern_regex = re.compile(pattern)
+        pods = [p for p in pods if pattern_regex.search(p.metadata.name)]
     if len(pods) == 0:
         console.print("No pods found. Use `lep pod create` to create pods.")
         return 0
 
-    pods_count = len(pods)
-    ssh_ports = [None] * pods_count
-    tcp_ports = [None] * pods_count
-    tcp_ports_jupyterlab = [None] * pods_count
-    for index, pod in enumerate(pods):
+    # Maps the container port of each pod to its (container port, host port)
+    # pair, for the ports that the pod list knows how to display.
+    pod_port_maps = []
+    two_ports = (SSH_PORT, TCP_PORT)
+    three_ports = (SSH_PORT, TCP_PORT, TCP_JUPYTER_PORT)
+    for pod in pods:
+        port_map = {}
+        pod_port_maps.append(port_map)
         ports = pod.spec.container.ports
-        port_pairs = [(p.container_port, p.host_port) for p in ports]
-        if len(port_pairs) not in [2, 3]:
+        if len(ports) not in (2, 3):
+            port_pairs = [(p.container_port, p.host_port) for p in ports]
             console.print(
                 f"Pod {pod.metadata.name} does not have exactly two or three ports."
                 f" This is not supported. it has \n {port_pairs}"
             )
             continue
 
-        for port_pair in port_pairs:
-            if port_pair[0] == SSH_PORT:
-                ssh_ports[index] = port_pair
-            elif port_pair[0] == TCP_PORT:
-                tcp_ports[index] = port_pair
-            elif len(port_pairs) == 3 and port_pair[0] == TCP_JUPYTER_PORT:
-                tcp_ports_jupyterlab[index] = port_pair
+        supported_ports = three_ports if len(ports) == 3 else two_ports
+        for p in ports:
+            port_pair = (p.container_port, p.host_port)
+            if p.container_port in supported_ports:
+                port_map[p.container_port] = port_pair
             else:
                 console.print(
                     f"Warning: Pod [red]{pod.metadata.name}[/] has an unsupported port"
                     f" [red]{port_pair}.[/]"
                 )
 
-    pod_ips = [None] * pods_count
-    for index, pod in enumerate(pods):
-        if pod.status.state in ("Running", "Ready"):
-            public_ip = _get_only_replica_public_ip(pod.metadata.name)
-            pod_ips[index] = public_ip
+    # Looking up the public ip takes one replica listing per running pod, so
+    # the lookups are issued concurrently.
+    running_pods = [
+        pod.metadata.name
+        for pod in pods
+        if pod.status.state in DEPLOYMENT_RUNNING_STATES
+    ]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        running_pod_ips = dict(
+            zip(
+                running_pods,
+                executor.map(_get_only_replica_public_ip, running_pods),
+            )
+        )
+    pod_ips = [running_pod_ips.get(pod.metadata.name) for pod in pods]
     logger.trace(f"Pod IPs:\n{pod_ips}")
 
     table = Table(title="pods", show_lines=True)
@@ -272,9 +279,10 @@ def list_command(pattern):
         justify="center",
     )
     table.add_column("created at")
-    for pod, ssh_port, tcp_port, tcp_port_jupyterlab, pod_ip in zip(
-        pods, ssh_ports, tcp_ports, tcp_ports_jupyterlab, pod_ips
-    ):
+    for pod, port_map, pod_ip in zip(pods, pod_port_maps, pod_ips):
+        ssh_port = port_map.get(SSH_PORT)
+        tcp_port = port_map.get(TCP_PORT)
+        tcp_port_jupyterlab = port_map.get(TCP_JUPYTER_PORT)
         Jupyter_lab_mapping = (
             f"{tcp_port_jupyterlab[0]} -> {tcp_port_jupyterlab[1]} \n(pod  -> client)"
             if tcp_port_jupyterlab
@@ -318,7 +326,7 @@ def remove(name):
     Removes a pod.
     """
 
-    client = APIClient()
+    client = _get_client()
 
     client.deployment.delete(name)
     console.log(f"Pod [green]{name}[/] removed.")
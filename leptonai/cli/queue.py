@@ -10,8 +10,8 @@ from rich.table import Table
 from .util import (
     console,
     click_group,
+    _get_client,
 )
-from ..api.v1.client import APIClient
 
 
 @click_group()
@@ -35,7 +35,7 @@ def create(name):
     """
     Creates a queue of the given name.
     """
-    client = APIClient()
+    client = _get_client()
     client.queue.create(name=name)
     console.print(
         f"Successfully created queue [green]{name}[/].\nNote that queue creation is"
@@ -53,7 +53,7 @@ def list_command(pattern):
     Lists all queues in the current workspace. Note that the queue values are
     always hidden.
     """
-    client = APIClient()
+    client = _get_client()
     queue_list = client.queue.list_all()
 
     if pattern:
@@ -82,7 +82,7 @@ def remove(name):
     """
     Removes the queue with the given name.
     """
-    client = APIClient()
+    client = _get_client()
     client.queue.delete(name)
     console.print(
         f"Successfully deleted queue [green]{name}[/].\nNote that queue deletion is"
@@ -98,7 +98,7 @@ def send(name, message):
     """
     Sends a message to the queue with the given name.
     """
-    client = APIClient()
+    client = _get_client()
     client.queue.send(name, message)
     console.print(f"Successfully sent message to queue [green]{name}[/].")
 
@@ -110,7 +110,7 @@ def receive(name):
     Receives a message from the queue with the given name.
     """
 
-    client = APIClient()
+    client = _get_client()
     queue_message_list = client.queue.receive(name)
 
     if queue_message_list is not None and len(queue_message_list) == 0:
@@ -10,9 +10,9 @@ from .util import (
     console,
     check,
     click_group,
+    _get_client,
 )
 from leptonai.config import LEPTON_RESERVED_ENV_NAMES
-from ..api.v1.client import APIClient
 from ..api.v1.types.common import SecretItem
 
 
@@ -52,8 +52,8 @@ def create(name, value):
             "Here is a list of all reserved environment variable names:\n"
             f"{LEPTON_RESERVED_ENV_NAMES}",
         )
-    client = APIClient()
-    existing_secrets = client.secret.list_all()
+    client = _get_client()
+    existing_secrets = set(client.secret.list_all())
 
     if existing_secrets:
         for n in name:
@@ -80,7 +80,7 @@ def list_command():
     Lists all secrets in the current workspace. Note that the secret values are
     always hidden.
     """
-    client = APIClient()
+    client = _get_client()
     secrets = client.secret.list_all()
     secrets.sort()
     table = Table(title="Secrets", show_lines=True)
@@ -97,7 +97,7 @@ def remove(name):
     """
     Removes the secret with the given name.
     """
-    client = APIClient()
+    client = _get_client()
     client.secret.delete(name)
     console.print(f"Secret [green]{name}[/] deleted successfully.")
 
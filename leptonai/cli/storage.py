@@ -10,13 +10,14 @@ from rich.theme import Theme
 from .constants import STORAGE_DISPLAY_PREFIX_LAST, STORAGE_DISPLAY_PREFIX_MIDDLE
 import click
 
+from leptonai.api.v1.api_resource import ClientError
 from .util import (
     click_group,
     sizeof_fmt,
     check,
     _get_only_replica_public_ip,
+    _get_client,
 )
-from ..api.v1.client import APIClient
 
 custom_theme = Theme({
     "directory": "bold cyan",
@@ -25,6 +26,20 @@ custom_theme = Theme({
 console = Console(highlight=False, theme=custom_theme)
 
 
+def _get_file_type_or_none(client, path, file_system):
+    """
+    Returns "file" or "dir" for the given remote path, or None if it does not
+    exist. get_file_type lists the parent directory, which fails with a client
+    error if the parent directory itself does not exist, so that is treated as
+    not found as well.
+    """
+    try:
+        return client.storage.get_file_type(path, file_system)
+    except ClientError as e:
+        logger.debug(f"Failed to get the file type of {path}: {e}")
+        return None
+
+
 def print_dir_contents(dir_path, dir_infos):
     """
     Format the contents of a directory for printing.
@@ -35,11 +50,12 @@ def print_dir_contents(dir_path, dir_infos):
     """
     num_directories = 0
     num_files = 0
+    last_index = len(dir_infos) - 1
     for i, dir_info in enumerate(dir_infos):
         console.print(f"[directory]{dir_path}[/directory]") if i == 0 else None
         prefix = (
             STORAGE_DISPLAY_PREFIX_LAST
-            if i == len(dir_infos) - 1
+            if i == last_index
             else STORAGE_DISPLAY_PREFIX_MIDDLE
         )
         if dir_info.type == "dir":
@@ -77,7 +93,7 @@ def du():
     """
     Returns total disk usage of the workspace
     """
-    client = APIClient()
+    client = _get_client()
 
     file_system = client.storage.total_file_system_usage_bytes()
 
@@ -101,12 +117,15 @@ def ls(path, file_system):
     """
     List the contents of a directory of the current file storage.
     """
-    fs_info = " in " + file_system if file_system else None
-    client = APIClient()
-    check(
-        client.storage.check_exists(path, file_system),
-        f"[red]{path}{fs_info}[/] not found",
-    )
+    fs_info = " in " + file_system if file_system else ""
+    client = _get_client()
+    # The root directory always exists, so only other paths need the round trip
+    # to check for existence.
+    if path != "/":
+        check(
+            client.storage.check_exists(path, file_system),
+            f"[red]{path}{fs_info}[/] not found",
+        )
 
     dir_infos = client.storage.get_dir(path, file_system)
 
@@ -128,15 +147,15 @@ def rm(path, file_system):
     not supported yet.
     """
 
-    client = APIClient()
+    client = _get_client()
 
-    fs_info = " in " + file_system if file_system else None
-    check(
-        client.storage.check_exists(path, file_system),
-        f"[red]{path}{fs_info}[/] not found",
-    )
+    fs_info = " in " + file_system if file_system else ""
+    # A single listing of the parent directory covers both the existence and
+    # the type check.
+    file_type = _get_file_type_or_none(client, path, file_system)
+    check(file_type is not None, f"[red]{path}{fs_info}[/] not found")
 
-    if (client.storage.get_file_type(path, file_system)) == "dir":
+    if file_type == "dir":
         console.print(
             f"[red]{path}[/] is a directory. Use [red]rmdir {path}[/] to delete"
             " directories."
@@ -149,7 +168,7 @@ def rm(path, file_system):
 
 @storage.command()
 def ls_file_system():
-    client = APIClient()
+    client = _get_client()
 
     table = Table(
         show_header=True,
@@ -180,15 +199,13 @@ def rmdir(path, file_system):
     must be empty. Note that wildcard is not supported yet.
     """
 
-    client = APIClient()
+    client = _get_client()
 
-    fs_info = " in " + file_system if file_system else None
-    check(
-        client.storage.check_exists(path, file_system),
-        f"[red]{path}{fs_info}[/] not found",
-    )
+    fs_info = " in " + file_system if file_system else ""
+    file_type = _get_file_type_or_none(client, path, file_system)
+    check(file_type is not None, f"[red]{path}{fs_info}[/] not found")
 
-    if (client.storage.get_file_type(path, file_system)) != "dir":
+    if file_type != "dir":
         console.print(
             f"[red]{path}[/] is a file. Use [red]rm {path}[/] to delete files."
         )
@@ -212,7 +229,7 @@ def mkdir(path, file_system):
     Create a directory in the file storage of the current workspace.
     """
 
-    client = APIClient()
+    client = _get_client()
     client.storage.create_dir(path, file_system)
     console.print(f"Created directory [green]{path}[/].")
 
@@ -256,7 +273,7 @@ def upload(local_path, remote_path, rsync, recursive, progress, file_system):
     file will be uploaded to that directory with its local name.
     """
     # if the remote path is a directory, upload the file with its local name to that directory
-    client = APIClient()
+    client = _get_client()
 
     if remote_path[-1] == "/":
         remote_path = remote_path + local_path.split("/")[-1]
@@ -286,15 +303,14 @@ def upload(local_path, remote_path, rsync, recursive, progress, file_system):
         if len(pwd) > 8:
             pwd = pwd[:8]
         env_vars = {"RSYNC_PASSWORD": pwd}
-        flags = "-v"
-        if recursive:
-            flags += "a"
+        command_parts = ["rsync", "-va" if recursive else "-v"]
         if progress:
-            flags += " --progress"
-        command = (
-            f"rsync {flags}"
-            f" {local_path} rsync://{workspace_id}@{ip}:{port}/volume{remote_path}"
-        )
+            command_parts.append("--progress")
+        command_parts += [
+            local_path,
+            f"rsync://{workspace_id}@{ip}:{port}/volume{remote_path}",
+        ]
+        command = " ".join(command_parts)
         console.print(f"Running command: [bold]{command}[/]")
 
         process = subprocess.Popen(
@@ -332,15 +348,13 @@ def download(remote_path, local_path, file_system):
     downloaded to the current working directory with the same name as the remote
     file.
     """
-    client = APIClient()
+    client = _get_client()
 
-    fs_info = " in " + file_system if file_system else None
-    check(
-        client.storage.check_exists(remote_path, file_system),
-        f"[red]{remote_path}{fs_info}[/] not found",
-    )
+    fs_info = " in " + file_system if file_system else ""
+    file_type = _get_file_type_or_none(client, remote_path, file_system)
+    check(file_type is not None, f"[red]{remote_path}{fs_info}[/] not found")
 
-    if client.storage.get_file_type(remote_path, file_system) != "file":
+    if file_type != "file":
         console.print(f"[red]{remote_path}[/] is not a file")
         sys.exit(1)
 
@@ -6,12 +6,19 @@ tmpdir = tempfile.mkdtemp()
 os.environ["LEPTON_CACHE_DIR"] = tmpdir
 
 import unittest
+from unittest import mock
 
 from click.testing import CliRunner
 from loguru import logger
 
 from leptonai import config, __version__
 from leptonai.cli import lep as cli
+from leptonai.api.v1.storage import StorageAPI
+from leptonai.api.v1.types.photon import PhotonDeploymentTemplate
+from leptonai.cli import deployment as cli_deployment
+from leptonai.cli import photon as cli_photon
+from leptonai.cli import storage as cli_storage
+from leptonai.cli import util as cli_util
 from leptonai.cli.photon import _sequentialize_pip_commands
 
 
@@ -122,6 +129,224 @@ class TestPipSequences(unittest.TestCase):
             )
 
 
+class TestDeploymentNameCompletion(unittest.TestCase):
+    def test_completion_uses_cached_names(self):
+        client = mock.MagicMock(workspace_id="completion-test")
+        client.deployment.list_all.return_value = [
+            mock.MagicMock(**{"metadata.name": name}) for name in ("foo", "bar", "fob")
+        ]
+        cli_util._list_deployment_names.cache_clear()
+        with mock.patch.object(cli_util, "_get_client", return_value=client):
+            items = cli_util.DeploymentName().shell_complete(None, None, "fo")
+            self.assertEqual([item.value for item in items], ["fob", "foo"])
+            # The second completion is served from the on-disk cache.
+            cli_util._list_deployment_names.cache_clear()
+            items = cli_util.DeploymentName().shell_complete(None, None, "b")
+            self.assertEqual([item.value for item in items], ["bar"])
+        client.deployment.list_all.assert_called_once()
+        cli_util._list_deployment_names.cache_clear()
+
+    def test_remove_clears_cached_names(self):
+        client = mock.MagicMock(workspace_id="completion-remove-test")
+        deployments = [
+            mock.MagicMock(**{"metadata.name": name}) for name in ("foo", "bar")
+        ]
+        client.deployment.list_all.return_value = deployments
+        cli_util._list_deployment_names.cache_clear()
+        with mock.patch.object(
+            cli_util, "_get_client", return_value=client
+        ), mock.patch.object(cli_deployment, "_get_client", return_value=client):
+            cli_util.DeploymentName().shell_complete(None, None, "")
+            path = cli_util._deployment_names_cache_path(client)
+            self.assertTrue(os.path.exists(path))
+
+            result = CliRunner().invoke(
+                cli_deployment.deployment, ["remove", "-n", "foo"]
+            )
+            self.assertEqual(result.exit_code, 0, result.output)
+            self.assertFalse(os.path.exists(path))
+
+            client.deployment.list_all.return_value = deployments[1:]
+            items = cli_util.DeploymentName().shell_complete(None, None, "")
+            self.assertEqual([item.value for item in items], ["bar"])
+        cli_util._list_deployment_names.cache_clear()
+
+
+class TestPhotonTemplateCache(unittest.TestCase):
+    def _client(self, template):
+        client = mock.MagicMock(workspace_id="template-cache-test")
+        client.photon.get.return_value = mock.MagicMock(deployment_template=template)
+        return client
+
+    def _cache_path(self, client, photon_id):
+        return cli_util._photon_template_cache_path(client, photon_id, False)
+
+    def test_miss_then_hit(self):
+        template = PhotonDeploymentTemplate(resource_shape="cpu.small", secret=["S"])
+        client = self._client(template)
+        path = self._cache_path(client, "miss-then-hit")
+        self.assertFalse(os.path.exists(path))
+
+        result = cli_util._get_photon_deployment_template(
+            client, "miss-then-hit", False
+        )
+        self.assertEqual(result, template)
+        self.assertTrue(os.path.exists(path))
+
+        result = cli_util._get_photon_deployment_template(
+            client, "miss-then-hit", False
+        )
+        self.assertEqual(result, template)
+        client.photon.get.assert_called_once_with("miss-then-hit", False)
+
+    def test_corrupt_entry_is_refetched(self):
+        template = PhotonDeploymentTemplate(env={"A": "1"})
+        client = self._client(template)
+        path = self._cache_path(client, "corrupt")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write("not json")
+
+        result = cli_util._get_photon_deployment_template(client, "corrupt", False)
+        self.assertEqual(result, template)
+        client.photon.get.assert_called_once()
+        # The corrupt entry is replaced by a valid one.
+        cli_util._get_photon_deployment_template(client, "corrupt", False)
+        client.photon.get.assert_called_once()
+
+    def test_none_template(self):
+        client = self._client(None)
+        for _ in range(2):
+            self.assertIsNone(
+                cli_util._get_photon_deployment_template(client, "no-template", False)
+            )
+        client.photon.get.assert_called_once()
+
+    def test_removed_on_photon_remove(self):
+        client = self._client(PhotonDeploymentTemplate())
+        cli_util._get_photon_deployment_template(client, "removed", False)
+        path = self._cache_path(client, "removed")
+        self.assertTrue(os.path.exists(path))
+
+        runner = CliRunner()
+        with mock.patch.object(
+            cli_photon, "_get_client", return_value=client
+        ), mock.patch.object(
+            cli_photon.WorkspaceRecord, "get_current_workspace_id", return_value="ws"
+        ):
+            result = runner.invoke(cli_photon.photon, ["remove", "-i", "removed"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertFalse(os.path.exists(path))
+
+
+class TestPhotonRemove(unittest.TestCase):
+    def _invoke(self, client, args, ids=None):
+        with mock.patch.object(
+            cli_photon, "_get_client", return_value=client
+        ), mock.patch.object(
+            cli_photon.WorkspaceRecord, "get_current_workspace_id", return_value="ws"
+        ), mock.patch.object(
+            cli_photon, "_get_ordered_photon_ids_or_none", return_value=ids
+        ), mock.patch.object(
+            cli_photon, "_remove_cached_photon_template"
+        ) as remove_cached, mock.patch.object(
+            cli_photon._list_photons, "cache_clear"
+        ) as cache_clear:
+            result = CliRunner().invoke(cli_photon.photon, ["remove"] + args)
+        cache_clear.assert_called_once()
+        return result, remove_cached
+
+    def test_partial_failure(self):
+        def delete(id_, public_photon=False):
+            if id_ == "b":
+                raise RuntimeError("boom")
+            return True
+
+        client = mock.MagicMock()
+        client.photon.delete.side_effect = delete
+        result, remove_cached = self._invoke(
+            client, ["-n", "p", "--all"], ids=["a", "b", "c"]
+        )
+        self.assertEqual(result.exit_code, 1, result.output)
+        self.assertIn("Photon id a removed.", result.output)
+        self.assertIn("Failed to remove photon id b: boom", result.output)
+        self.assertIn("Photon id c removed.", result.output)
+        self.assertIn("Failed to remove photon id(s): b.", result.output)
+        self.assertEqual([c.args[1] for c in remove_cached.call_args_list], ["a", "c"])
+
+    def test_single_id_is_removed_inline(self):
+        client = mock.MagicMock()
+        with mock.patch.object(cli_photon, "ThreadPoolExecutor") as executor:
+            result, _ = self._invoke(client, ["-i", "a"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        executor.assert_not_called()
+        client.photon.delete.assert_called_once_with("a", public_photon=False)
+
+    def test_public_photon(self):
+        client = mock.MagicMock()
+        result, _ = self._invoke(client, ["-i", "a", "--public-photon"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        client.photon.delete.assert_called_once_with("a", public_photon=True)
+
+
+class TestPhotonPushAndRun(unittest.TestCase):
+    def test_push_returns_created_photon(self):
+        photon = mock.MagicMock(id_="pushed-id")
+        client = mock.MagicMock()
+        client.photon.create.return_value = photon
+        with tempfile.NamedTemporaryFile(suffix=".photon") as f, mock.patch.object(
+            cli_photon, "_get_client", return_value=client
+        ), mock.patch("leptonai.photon.base.find_local_photon", return_value=f.name):
+            result = CliRunner().invoke(
+                cli_photon.photon, ["push", "-n", "p"], standalone_mode=False
+            )
+        self.assertIsNone(result.exception, result.output)
+        self.assertIs(result.return_value, photon)
+        self.assertIn("pushed to workspace", result.output)
+
+    def test_run_with_model_uses_pushed_id(self):
+        deployment_create = mock.MagicMock()
+        deployment_create.make_context.return_value.params = {}
+        with mock.patch.object(
+            cli_photon.WorkspaceRecord, "current", return_value=mock.MagicMock()
+        ), mock.patch.object(cli_photon, "create"), mock.patch.object(
+            cli_photon, "push", return_value=mock.MagicMock(id_="pushed-id")
+        ), mock.patch.object(
+            cli_photon, "_find_deployment_name_or_die", return_value="p"
+        ), mock.patch.object(
+            cli_photon, "_get_most_recent_photon_id_or_none"
+        ) as most_recent, mock.patch.object(
+            cli_photon, "deployment_create", deployment_create
+        ):
+            result = CliRunner().invoke(
+                cli_photon.photon, ["run", "-n", "p", "-m", "py:model.py"]
+            )
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("Running the version just pushed: pushed-id", result.output)
+        most_recent.assert_not_called()
+        deployment_create.assert_called_once_with(name="p", photon_id="pushed-id")
+
+
+class TestStorageMissingPath(unittest.TestCase):
+    def test_missing_parent_directory(self):
+        # Listing a directory that does not exist returns 404.
+        client = mock.MagicMock()
+        client._get.return_value = mock.MagicMock(status_code=404, text="not found")
+        client.storage = StorageAPI(client)
+        runner = CliRunner()
+        with mock.patch.object(cli_storage, "_get_client", return_value=client):
+            for args in (
+                ["rm", "/missing/x.txt"],
+                ["rmdir", "/missing/x"],
+                ["download", "/missing/x.txt"],
+            ):
+                result = runner.invoke(cli_storage.storage, args)
+                self.assertEqual(result.exit_code, 1, result.output)
+                self.assertIn(f"{args[1]} not found", result.output)
+                self.assertNotIsInstance(result.exception, RuntimeError)
+        client._delete.assert_not_called()
+
+
 class TestNoMothershipWorkspace(unittest.TestCase):
     @unittest.skipIf(
         os.getenv("TESTONLY_NO_MOTHERSHIP_LOGIN_CREDENTIALS") is None,
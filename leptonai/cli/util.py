@@ -2,20 +2,237 @@
 Common utilities for the CLI.
 """
 
+from functools import lru_cache
+import json
+import os
 import sys
-from typing import Any, Dict
+import time
+from typing import Any, Dict, List, Optional, Set
 from urllib.parse import urlparse
 
 import click
 from loguru import logger
 
+from rich.columns import Columns
 from rich.console import Console
+from rich.table import Table
+from leptonai.config import CACHE_DIR, VALID_SHAPES
 from leptonai.api.v1.client import APIClient
+from leptonai.api.v1.types.photon import Photon, PhotonDeploymentTemplate
+from leptonai.api.v1.workspace_record import WorkspaceRecord
 
 
 console = Console(highlight=False)
 
 
+@lru_cache(maxsize=1)
+def _cached_client(*unused_workspace_key: Optional[str]) -> APIClient:
+    return APIClient()
+
+
+def _get_client() -> APIClient:
+    """
+    Returns the api client of the current workspace. The client is cached, so
+    that all the commands and helpers invoked in the same process share one
+    client (and its http session) instead of re-creating it on every call. A
+    new client is created if the workspace being used changes, e.g. after a
+    `lep login` or a change of the LEPTON_WORKSPACE_* environment variables.
+
+    Some commands issue independent api calls from a thread pool using this
+    client, and thus share its requests.Session. requests does not guarantee
+    that a Session is thread safe in general, but the calls made this way only
+    send requests and never modify the session itself: headers and timeouts
+    are passed per request, and no adapters are mounted. The underlying urllib3
+    connection pool is thread safe, and the cookie jar guards itself with a
+    lock. Keep such thread pools at most 10 workers, the default pool size of
+    a Session, so that connections are reused rather than discarded.
+    """
+    current = WorkspaceRecord.current()
+    return _cached_client(
+        os.environ.get("LEPTON_WORKSPACE_ID"),
+        os.environ.get("LEPTON_WORKSPACE_TOKEN"),
+        os.environ.get("LEPTON_WORKSPACE_URL"),
+        current.id_ if current else None,
+        current.auth_token if current else None,
+        current.url if current else None,
+    )
+
+
+@lru_cache(maxsize=2)
+def _list_photons(client: APIClient, public_photon: bool) -> List[Photon]:
+    """
+    Returns the photons of the workspace that the client is associated with.
+
+    The listing is cached for the lifetime of the process, as one command may
+    look up photons multiple times (e.g. `lep photon run` resolving the latest
+    photon id, and then the nested `lep deployment create`). Commands that
+    create or remove photons should call `_list_photons.cache_clear()`.
+    """
+    return client.photon.list_all(public_photon=public_photon)
+
+
+@lru_cache(maxsize=2)
+def _photons_by_name(client: APIClient, public_photon: bool) -> Dict[str, List[Photon]]:
+    """
+    Returns the photons of the workspace keyed by name, with the versions of
+    each photon ordered from the newest to the oldest. Commands that clear the
+    `_list_photons` cache should clear this cache as well.
+    """
+    photons_by_name: Dict[str, List[Photon]] = {}
+    for p in _list_photons(client, public_photon):
+        photons_by_name.setdefault(p.name, []).append(p)
+    for versions in photons_by_name.values():
+        versions.sort(key=lambda p: p.created_at, reverse=True)  # type: ignore
+    return photons_by_name
+
+
+@lru_cache(maxsize=1)
+def _list_deployment_names(client: APIClient) -> Set[str]:
+    """
+    Returns the names of the deployments in the workspace that the client is
+    associated with. The listing is cached, as `lep photon run` checks the
+    deployment name before invoking `lep deployment create`, which checks it
+    again. Commands that create or remove deployments should call
+    `_clear_deployment_names_cache()`.
+    """
+    return {d.metadata.name for d in client.deployment.list_all()}
+
+
+def _deployment_names_cache_path(client: APIClient) -> str:
+    return os.path.join(CACHE_DIR, "deployment-names", f"{client.workspace_id}.json")
+
+
+def _clear_deployment_names_cache(client: APIClient) -> None:
+    """
+    Clears the cached deployment names of the workspace, both the in-process
+    listing and the on-disk names used for shell completion.
+    """
+    _list_deployment_names.cache_clear()
+    try:
+        os.remove(_deployment_names_cache_path(client))
+    except OSError:
+        pass
+
+
+def _deployment_names_for_completion(ttl: int = 60) -> List[str]:
+    """
+    Returns the deployment names of the current workspace for shell completion.
+
+    The names are cached on disk under CACHE_DIR/deployment-names, and the
+    cache is refreshed once it is older than `ttl` seconds, so that repeatedly
+    pressing tab does not hit the server every time. Returns an empty list if
+    the names cannot be obtained, e.g. when not logged in.
+    """
+    try:
+        client = _get_client()
+        path = _deployment_names_cache_path(client)
+        try:
+            if time.time() - os.path.getmtime(path) < ttl:
+                with open(path) as f:
+                    return json.load(f)
+        except (OSError, ValueError):
+            pass
+        names = sorted(_list_deployment_names(client))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(names, f)
+        return names
+    except Exception as e:
+        logger.debug(f"Failed to get deployment names for completion: {e}")
+        return []
+
+
+class DeploymentName(click.ParamType):
+    """
+    The name of an existing deployment. It behaves like a plain string, but
+    offers the deployment names of the current workspace for shell completion.
+    The name is not validated here, as the cached names may be outdated; the
+    server reports if the deployment does not exist.
+    """
+
+    name = "deployment_name"
+
+    def convert(self, value, param, ctx):
+        return value
+
+    def shell_complete(self, ctx, param, incomplete):
+        from click.shell_completion import CompletionItem
+
+        return [
+            CompletionItem(name)
+            for name in _deployment_names_for_completion()
+            if name.startswith(incomplete)
+        ]
+
+
+def _photon_template_cache_path(
+    client: APIClient, photon_id: str, public_photon: bool
+) -> str:
+    return os.path.join(
+        CACHE_DIR,
+        "photon-templates",
+        client.workspace_id,
+        "public" if public_photon else "private",
+        f"{photon_id}.json",
+    )
+
+
+def _get_photon_deployment_template(
+    client: APIClient, photon_id: str, public_photon: bool
+) -> Optional[PhotonDeploymentTemplate]:
+    """
+    Returns the deployment template of the photon of the given id.
+
+    The deployment template is part of the photon spec pushed with the photon,
+    and never changes for a given photon id. It is therefore cached on disk
+    under CACHE_DIR/photon-templates after the first fetch, so that deploying
+    the same photon again does not need to fetch the photon info. Only the
+    template is cached: the rest of the photon info, such as its status, can
+    change on the server and should always be fetched.
+
+    Entries never expire, and are only removed when the photon is removed with
+    `lep photon remove` on this machine, so the cache grows without bound. It
+    can be safely cleared by deleting CACHE_DIR/photon-templates.
+    """
+    path = _photon_template_cache_path(client, photon_id, public_photon)
+    try:
+        with open(path) as f:
+            template = json.load(f)["deployment_template"]
+        return PhotonDeploymentTemplate(**template) if template is not None else None
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        # A corrupted cache entry, so we simply fetch the photon again.
+        logger.debug(f"Ignoring invalid photon template cache {path}: {e}")
+    template = client.photon.get(photon_id, public_photon).deployment_template
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "deployment_template": (
+                        template.dict(by_alias=True) if template is not None else None
+                    )
+                },
+                f,
+            )
+    except OSError as e:
+        logger.debug(f"Failed to cache photon template to {path}: {e}")
+    return template
+
+
+def _remove_cached_photon_template(
+    client: APIClient, photon_id: str, public_photon: bool = False
+) -> None:
+    """
+    Removes the cached deployment template of the photon of the given id, if any.
+    """
+    try:
+        os.remove(_photon_template_cache_path(client, photon_id, public_photon))
+    except OSError:
+        pass
+
+
 def catch_deprecated_flag(old_name, new_name):
     def warn_old_name(ctx, param, value):
         if ctx.get_parameter_source(old_name) == click.core.ParameterSource.COMMANDLINE:
@@ -133,7 +350,7 @@ def sizeof_fmt(num, suffix="B"):
 
 
 def _get_only_replica_public_ip(name: str):
-    client = APIClient()
+    client = _get_client()
     replicas = client.deployment.get_replicas(name)
     logger.trace(f"Replicas for {name}:\n{replicas}")
 
@@ -144,17 +361,32 @@ def _get_only_replica_public_ip(name: str):
 
 
 def _get_valid_nodegroup_ids(node_groups: [str]):
-    client = APIClient()
+    client = _get_client()
     valid_ng = client.nodegroup.list_all()
     valid_ng_map: Dict[str, str] = {ng.metadata.name: ng.metadata.id_ for ng in valid_ng}  # type: ignore
     node_group_ids = []
     for ng in node_groups:
         if ng not in valid_ng_map:
-            console.print(
-                f"Invalid node group: [red]{ng}[/] (valid node groups:"
-                f" {', '.join(valid_ng_map.keys())})"
-            )
+            console.print(f"Invalid node group: [red]{ng}[/]. Valid node groups:")
+            console.print(Columns(list(valid_ng_map), padding=(0, 2), expand=False))
             sys.exit(1)
         node_group_ids.append(valid_ng_map[ng])
 
     return node_group_ids
+
+
+def _check_resource_shape_or_die(resource_shape: Optional[str]):
+    """
+    Exits with the list of valid resource shapes if no resource shape is given.
+    """
+    if resource_shape is not None:
+        return
+    table = Table(show_header=False, box=None, padding=(0, 6))
+    table.add_column()
+    for shape in VALID_SHAPES:
+        table.add_row(shape)
+    console.print(
+        "[red]Error: Missing option '--resource-shape'.[/] Available types are:"
+    )
+    console.print(table)
+    sys.exit(1)
@@ -130,6 +130,22 @@ class TestPhotonCli(unittest.TestCase):
         self.assertEqual(result.exit_code, 0)
         self.assertNotIn("abcdef", result.output.lower())
 
+    def test_photon_metadata_local(self):
+        name = random_name()
+
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            ["photon", "create", "-n", name, "-m", "py:leptonai.photon.prebuilt.Echo"],
+        )
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("created", result.output.lower())
+
+        result = runner.invoke(cli, ["photon", "metadata", "-n", name, "--local"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn(f'"name": "{name}"', result.output)
+        self.assertIn("py:leptonai.photon.prebuilt.Echo", result.output)
+
     @skip_if_macos
     @sub_test([
         (diffusers_model,),
@@ -35,6 +35,11 @@ def switch_cwd(path):
         os.chdir(old_cwd)
 
 
+# copied from
+# https://github.com/leptonai/lepton/blob/732311f395476b67295a730b0be4d104ed7f5bef/api-server/util/util.go#L26
+_NAME_REGEX = re.compile(r"^[a-z]([-a-z0-9]*[a-z0-9])?$")
+
+
 def check_photon_name(name):
     assert isinstance(name, str), "Photon name must be a string"
 
@@ -43,10 +48,7 @@ def check_photon_name(name):
             f"Invalid Photon name '{name}': Name must be less than 32 characters"
         )
 
-    # copied from
-    # https://github.com/leptonai/lepton/blob/732311f395476b67295a730b0be4d104ed7f5bef/api-server/util/util.go#L26
-    name_regex = r"^[a-z]([-a-z0-9]*[a-z0-9])?$"
-    if not re.match(name_regex, name):
+    if not _NAME_REGEX.match(name):
         raise ValueError(
             f"Invalid Photon name '{name}': Name must consist of lower case"
             " alphanumeric characters or '-', and must start with an alphabetical"